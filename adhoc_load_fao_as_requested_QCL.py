@@ -3,66 +3,11 @@
 FAO data extractor for milk production (2014–2023), corrected filter logic.
 """
 from datetime import datetime
+import numpy as np
 import pandas as pd
-import requests
 from typing import Literal, Any, Dict, List
 
-
-# FAOSTAT API wrapper
-class Request:
-    settings: Dict[str, Any] = {"timeout": 120.0}
-    expected_settings = {"timeout"}
-
-    def get(self, url: str, **kwargs) -> requests.Response:
-        with requests.get(url, **kwargs, **self.settings) as resp:
-            resp.raise_for_status()
-            return resp
-
-    @staticmethod
-    def get_data(response: requests.Response) -> List[Dict[str, Any]]:
-        return response.json()["data"]
-
-
-def fetch_data(url: str, **kwargs) -> List[Dict[str, Any]]:
-    resp = Request().get(url, **kwargs)
-    return Request.get_data(resp)
-
-
-class FAOSTAT:
-    baseurl = "https://faostatservices.fao.org/api/v1"
-    lang = "en"
-
-    def get_codelist(self, code_id: str, domain: str) -> pd.DataFrame:
-        url = f"{self.baseurl}/{self.lang}/codes/{code_id}/{domain}"
-        data = fetch_data(url)
-        return pd.DataFrame(data)
-
-    def get_data(self,
-                 domain: str,
-                 filters: Dict[str, Any],
-                 show_codes=True,
-                 show_flags=True,
-                 show_notes=True,
-                 null_values=True,
-                 limit=-1,
-                 output_type="objects") -> pd.DataFrame:
-        url = f"{self.baseurl}/{self.lang}/data/{domain}"
-        params = []
-        for k, v in filters.items():
-            params.append((k, v))
-        params += [
-            ("show_codes", show_codes),
-            ("show_flags", show_flags),
-            ("show_notes", show_notes),
-            ("null_values", null_values),
-            ("limit", limit),
-            ("output_type", output_type),
-        ]
-        data = fetch_data(url, params=params)
-        return pd.DataFrame(data)
-
-
-faostat_api = FAOSTAT()
+from faostat_client import faostat_api, write_csv
 
 
 # ------------------------------------------------------
@@ -85,7 +30,7 @@ def get_data(
                      2019, 2020, 2021, 2022, 2023]
         }
     print(f"Retrieving {domain_code} for items: {filters['item']} and years: {filters['year']}")
-    df = faostat_api.get_data(domain_code, filters)
+    df = faostat_api.get_data(domain_code, filters, null_values=True)
     return df
 
 
@@ -111,12 +56,16 @@ def load_production_data_of_crops_and_livestock_products(
     Load FAOSTAT milk production data (2014–2023) by label selection.
     """
     all_items = faostat_api.get_codelist("items", domain_code)
-    selection = all_items[all_items['label'].isin(crops)]
-    codes = selection['code'].astype(int).tolist()
+    crops_set = frozenset(crops)
+    mask = all_items['label'].isin(crops_set)
+    codes = all_items.loc[mask, 'code'].to_numpy(dtype=np.int32, copy=False).tolist()
 
+    # One bucket per year keeps each response (and its parsed frame) small
     df = faostat_api.get_data(
         domain_code,
-        filters={'item': codes, 'year': years}
+        filters={'item': codes, 'year': years},
+        null_values=True,
+        split_by='year',
     )
 
     if save_as_csv:
@@ -125,7 +74,7 @@ def load_production_data_of_crops_and_livestock_products(
             describe=f"{len(crops)}items_{len(years)}years",
             timestamp=datetime.now().strftime("%Y-%m-%dT%H%M%S"),
         )
-        df.to_csv(fname, index=False)
+        write_csv(df, fname)
         print(f"Saved output to {fname}")
 
     return df
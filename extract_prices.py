@@ -11,118 +11,12 @@
 #==================================INICIO DO CODIGO=====================================
 
  
+import numpy as np
 import pandas as pd
-import requests
 import os
 from datetime import datetime
-from typing import Literal
-
-# --------------------------------------------------
-# WRAPPER DE REQUISIÇÕES
-# --------------------------------------------------
-class Request:
-    settings: dict = {"timeout": 120.}
-    expected_settings: set = {"timeout"}
-
-    def configure(self, **kwargs):
-        assert set(kwargs.keys()).issubset(self.expected_settings), "Argumentos inválidos"
-        self.settings.update(kwargs)
-
-    def get(self, url: str, **kwargs) -> requests.Response:
-        with requests.get(url, **kwargs, **self.settings) as response:
-            self._raise_for_status(response, context={"url": url})
-            return response
-
-    def _raise_for_status(self, response: requests.Response, context: dict):
-        if response.status_code == 500 and response.text == "Index: 0, Size: 0":
-            resource = context["url"].split("/")[-1].split("?")[0]
-            raise Exception(f"{resource} não encontrado no servidor FAOSTAT")
-        if response.status_code == 524:
-            raise TimeoutError("Tempo de requisição excedido")
-        response.raise_for_status()
-
-    @staticmethod
-    def get_data(response: requests.Response) -> list[dict]:
-        return response.json().get("data", [])
-
-
-__requests__ = Request()
-
-
-def fetch_data(url: str, **kwargs) -> list[dict]:
-    resp = __requests__.get(url, **kwargs)
-    return Request.get_data(resp)
 
-
-# --------------------------------------------------
-# CLASSES DE SUPORTE
-# --------------------------------------------------
-class Records(list):
-    _expected_order: list[str]
-
-    def __init__(self, data: list[dict], columns: list[str] = []):
-        super().__init__(data)
-        self._expected_order = columns
-
-    @property
-    def df(self) -> pd.DataFrame:
-        cols = list(self._expected_order)
-        for rec in self:
-            for k in rec:
-                if k not in cols:
-                    cols.append(k)
-        return pd.DataFrame.from_records(self, columns=cols)
-
-
-class FAOSTAT:
-    baseurl: str = "https://faostatservices.fao.org/api/v1"
-    lang: Literal["en", "fr", "es"] = "en"
-
-    def get_codelist(self, code_id: str, domain_code: str) -> pd.DataFrame:
-        url = f"{self.baseurl}/{self.lang}/codes/{code_id}/{domain_code}"
-        data = fetch_data(url)
-        return Records(data).df
-
-    def get_data(
-        self,
-        domain_code: str,
-        filters: dict,
-        show_codes: bool = True,
-        show_flags: bool = True,
-        show_notes: bool = False,
-        null_values: bool = False,
-        limit: int = -1,
-        output_type: str = "objects"
-    ) -> pd.DataFrame:
-        url = f"{self.baseurl}/{self.lang}/data/{domain_code}"
-        params = []
-        
-        # Formata os parâmetros corretamente
-        for k, v in filters.items():
-            if isinstance(v, list):
-                params.append((k, ",".join(map(str, v))))
-            else:
-                params.append((k, v))
-                
-        params += [
-            ("show_codes", str(show_codes).lower()),
-            ("show_flags", str(show_flags).lower()),
-            ("show_notes", str(show_notes).lower()),
-            ("null_values", str(null_values).lower()),
-            ("limit", str(limit)),
-            ("output_type", output_type),
-        ]
-        
-        try:
-            data = fetch_data(url, params=params)
-            return Records(data).df
-        except Exception as e:
-            print(f"Erro ao acessar o domínio {domain_code}. Verifique se o domínio existe e os parâmetros estão corretos.")
-            raise
-
-
-# instância global
-faostat_api = FAOSTAT()
+from faostat_client import faostat_api, write_csv
 
 # --------------------------------------------------
 # FUNÇÃO PRINCIPAL DE EXTRAÇÃO DE PREÇOS
@@ -138,11 +32,13 @@ def load_price_data_of_grains(
         "Raw milk of sheep",
     ],
     years: list[int] = [2015,2016,2017,2018,2019,2020,2021,2022,2023,2024],
-    output_csv: str = "faostat_prices_{n_grains}grains_{n_years}years_{ts}.csv"
+    output_csv: str = "faostat_prices_{n_grains}grains_{n_years}years_{ts}.csv",
+    debug: bool = False
 ) -> str:
     """
     Extrai os preços de produção (domínio 'PP') para os grãos e anos especificados,
     salva sempre em CSV e retorna o caminho do arquivo gerado.
+    Com debug=True, testa antes o acesso ao domínio com uma requisição de um único item/ano.
     """
     try:
         # 1) obtém lista completa de itens (grãos)
@@ -152,7 +48,10 @@ def load_price_data_of_grains(
         
         # 2) filtra apenas os itens cujo label está em grains
         label_column = 'label' if 'label' in all_items.columns else 'description'
-        selection = all_items[all_items[label_column].isin(grains)]
+        grains_set = frozenset(grains)
+        mask = all_items[label_column].isin(grains_set)
+        selection = all_items.loc[mask]
+        codes = selection['code'].to_numpy(dtype=np.int32, copy=False).tolist()
         
         if selection.empty:
             raise ValueError(f"No items found matching the specified grains: {grains}")
@@ -161,33 +60,32 @@ def load_price_data_of_grains(
         print(selection[[label_column, 'code']])
             
         # 3) extrai os dados de preços
-        # Primeiro verifica se há dados disponíveis para os itens selecionados
-        print("Verificando disponibilidade de dados...")
-        
-        # Tenta obter dados para um único ano/item primeiro para testar
-        test_item = selection.iloc[0]['code']
-        test_year = years[0]
-        
-        try:
-            test_data = faostat_api.get_data(
-                domain_code=domain_code,
-                filters={
-                    "item": test_item,
-                    "year": test_year
-                },
-                show_codes=True,
-                show_flags=True,
-                limit=1
-            )
-            print(f"Teste bem-sucedido para item {test_item}, ano {test_year}")
-        except Exception as test_error:
-            raise Exception(f"Falha ao acessar dados do domínio {domain_code}. Verifique se o domínio existe e contém dados para os itens especificados. Erro: {str(test_error)}")
-        
-        # Se o teste passou, obtém todos os dados
+        if debug:
+            # Verifica se há dados disponíveis para um único ano/item antes da requisição completa
+            print("Verificando disponibilidade de dados...")
+            test_item = selection.iloc[0]['code']
+            test_year = years[0]
+
+            try:
+                test_data = faostat_api.get_data(
+                    domain_code=domain_code,
+                    filters={
+                        "item": test_item,
+                        "year": test_year
+                    },
+                    show_codes=True,
+                    show_flags=True,
+                    limit=1
+                )
+                print(f"Teste bem-sucedido para item {test_item}, ano {test_year}")
+            except Exception as test_error:
+                raise Exception(f"Falha ao acessar dados do domínio {domain_code}. Verifique se o domínio existe e contém dados para os itens especificados. Erro: {str(test_error)}")
+
+        # Os erros da requisição completa já são tratados em FAOSTAT.get_data
         df_prices = faostat_api.get_data(
             domain_code=domain_code,
             filters={
-                "item": list(selection['code'].astype(int)),
+                "item": codes,
                 "year": years
             },
             show_codes=True,
@@ -195,7 +93,8 @@ def load_price_data_of_grains(
             show_notes=False,
             null_values=False,
             limit=-1,
-            output_type="objects"
+            output_type="csv",
+            split_by="year"  # um bloco por ano mantém cada resposta pequena
         )
 
         # 4) gera o nome do arquivo e salva em CSV
@@ -204,7 +103,7 @@ def load_price_data_of_grains(
             n_years=len(years),
             ts=datetime.now().strftime("%Y%m%dT%H%M%S")
         )
-        df_prices.to_csv(filename, index=False)
+        write_csv(df_prices, filename)
         print(f"[OK] Dados de preços salvos em: {os.path.abspath(filename)}")
 
         return filename
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#==================================OBSERVAÇÕES=========================================
+
+# Cliente da API FAOSTAT compartilhado pelos extratores (uma única sessão HTTP,
+# cache e política de retentativas para todo o programa)
+
+#==================================FIM OBSERVAÇÕES=====================================
+
+import asyncio
+import io
+import pandas as pd
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from typing import Literal
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+# orjson é opcional: decodifica o JSON bem mais rápido que o módulo padrão
+try:
+    import orjson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+# pyarrow é opcional: grava o CSV em C++, bem mais rápido que DataFrame.to_csv
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
+# requests-cache é opcional: guarda as respostas em SQLite e evita baixar de novo os mesmos dados
+try:
+    from requests_cache import CachedSession
+except ImportError:
+    CachedSession = None
+
+CACHE_NAME = ".faostat_cache"
+CACHE_EXPIRE_AFTER = timedelta(days=7)
+
+# Limita o número de requisições simultâneas ao FAOSTAT
+MAX_CONCURRENT_REQUESTS = 10
+
+# Representação dos booleanos nos parâmetros da API
+_BOOL_STR = {True: "true", False: "false"}
+
+# Parâmetros de exibição já formatados para os valores padrão de FAOSTAT.get_data
+_DEFAULT_PARAMS = (
+    ("show_codes", "true"),
+    ("show_flags", "true"),
+    ("show_notes", "false"),
+    ("null_values", "false"),
+    ("limit", "-1"),
+)
+
+# Tipos das colunas de código/ano dos dados (evita a inferência de tipos do pandas)
+RESULT_DTYPES = {
+    "Year": "int16",
+    "Item Code": "int32",
+    "Element Code": "int32",
+    "Area Code": "int32",
+}
+
+# --------------------------------------------------
+# WRAPPER DE REQUISIÇÕES
+# --------------------------------------------------
+class Request:
+    __slots__ = ("settings", "expected_settings", "session")
+
+    settings: dict
+    expected_settings: set
+
+    def __init__(self):
+        self.settings = {"timeout": 120.}
+        self.expected_settings = {"timeout"}
+
+        # Sessão persistente: reaproveita as conexões (keep-alive) entre as chamadas
+        if CachedSession is not None:
+            self.session = CachedSession(
+                CACHE_NAME,
+                backend="sqlite",
+                expire_after=CACHE_EXPIRE_AFTER,
+                allowable_methods=("GET",),
+                cache_control=True,  # respeita o Cache-Control do FAOSTAT
+                stale_if_error=True,  # em caso de erro, usa a cópia em cache
+            )
+        else:
+            self.session = requests.Session()
+        # gzip/deflate, e br/zstd quando o urllib3 consegue decodificar
+        self.session.headers.update({"Accept-Encoding": ACCEPT_ENCODING})
+        # Falhas transitórias do FAOSTAT (5xx, 524) são repetidas com backoff exponencial
+        retries = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=[500, 502, 503, 504, 524],
+            allowed_methods=["GET"],
+            raise_on_status=False,  # esgotadas as tentativas, a última resposta segue para _raise_for_status
+        )
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=MAX_CONCURRENT_REQUESTS,
+            max_retries=retries,
+        )
+        self.session.mount("https://", adapter)
+
+    def configure(self, **kwargs):
+        assert set(kwargs.keys()).issubset(self.expected_settings), "Argumentos inválidos"
+        self.settings.update(kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        with self.session.get(url, **kwargs, **self.settings) as response:
+            self._raise_for_status(response, context={"url": url})
+            return response
+
+    def get_content(self, url: str, **kwargs) -> bytes:
+        # Lê o corpo em streaming; .content continua válido quando o requests-cache já consumiu o raw
+        with self.session.get(url, stream=True, **kwargs, **self.settings) as response:
+            self._raise_for_status(response, context={"url": url})
+            return response.content
+
+    def _raise_for_status(self, response: requests.Response, context: dict):
+        if response.status_code == 500 and response.text == "Index: 0, Size: 0":
+            resource = context["url"].split("/")[-1].split("?")[0]
+            raise Exception(f"{resource} não encontrado no servidor FAOSTAT")
+        if response.status_code == 524:
+            raise TimeoutError("Tempo de requisição excedido")
+        response.raise_for_status()
+
+    @staticmethod
+    def get_data(response: requests.Response) -> list[dict]:
+        return jsonlib.loads(response.content).get("data", [])
+
+
+__requests__ = Request()
+
+
+def fetch_data(url: str, **kwargs) -> list[dict]:
+    resp = __requests__.get(url, **kwargs)
+    return Request.get_data(resp)
+
+
+def fetch_frame(url: str, **kwargs) -> pd.DataFrame:
+    # Converte imediatamente para liberar os registros brutos antes do próximo bloco
+    data = fetch_data(url, **kwargs)
+    df = pd.DataFrame.from_records(data)
+    del data
+    dtypes = {col: dtype for col, dtype in RESULT_DTYPES.items() if col in df.columns}
+    return df.astype(dtypes, errors="ignore")
+
+
+def fetch_csv(url: str, **kwargs) -> pd.DataFrame:
+    content = __requests__.get_content(url, **kwargs)
+    if not content:
+        return pd.DataFrame()
+    return pd.read_csv(io.BytesIO(content), dtype=RESULT_DTYPES)
+
+
+# --------------------------------------------------
+# REQUISIÇÕES CONCORRENTES
+# --------------------------------------------------
+async def _afetch(semaphore: asyncio.Semaphore, fetch, url: str, params: list[tuple]):
+    async with semaphore:
+        return await asyncio.to_thread(fetch, url, params=params)
+
+
+async def _afetch_all(url: str, params_list: list[list[tuple]], fetch) -> list:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return await asyncio.gather(*[_afetch(semaphore, fetch, url, params) for params in params_list])
+
+
+def fetch_data_concurrently(url: str, params_list: list[list[tuple]], fetch=fetch_data) -> list:
+    """Executa uma requisição por conjunto de parâmetros e retorna os resultados na mesma ordem."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_afetch_all(url, params_list, fetch))
+
+    # Já existe um loop de eventos (ex.: Jupyter), onde asyncio.run não pode ser usado:
+    # as requisições rodam em threads, pois o requests libera o GIL durante a leitura do socket
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+        futures = [pool.submit(fetch, url, params=params) for params in params_list]
+        return [future.result() for future in futures]
+
+
+@lru_cache(maxsize=32)
+def _cached_codelist(url: str) -> pd.DataFrame:
+    """Baixa e monta cada lista de códigos uma única vez por sessão (são estáticas)."""
+    df = pd.DataFrame.from_records(fetch_data(url))
+    # Rótulos como categoria: o isin dos filtros compara códigos inteiros em vez de strings
+    for col in ("label", "description"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+# --------------------------------------------------
+# CLASSES DE SUPORTE
+# --------------------------------------------------
+class FAOSTAT:
+    __slots__ = ("baseurl", "lang")
+
+    baseurl: str
+    lang: Literal["en", "fr", "es"]
+
+    def __init__(
+        self,
+        baseurl: str = "https://faostatservices.fao.org/api/v1",
+        lang: Literal["en", "fr", "es"] = "en"
+    ):
+        self.baseurl = baseurl
+        self.lang = lang
+
+    def get_codelist(self, code_id: str, domain_code: str) -> pd.DataFrame:
+        url = f"{self.baseurl}/{self.lang}/codes/{code_id}/{domain_code}"
+        # Cópia: o chamador pode alterar o DataFrame sem afetar o cache
+        return _cached_codelist(url).copy()
+
+    def get_data(
+        self,
+        domain_code: str,
+        filters: dict,
+        show_codes: bool = True,
+        show_flags: bool = True,
+        show_notes: bool = False,
+        null_values: bool = False,
+        limit: int = -1,
+        output_type: str = "csv",
+        split_by: str = "item"
+    ) -> pd.DataFrame:
+        url = f"{self.baseurl}/{self.lang}/data/{domain_code}"
+
+        # Uma requisição por valor do filtro `split_by`, executadas em paralelo
+        values = filters.get(split_by)
+        if isinstance(values, (list, tuple)):
+            buckets = [{**filters, split_by: value} for value in values]
+        else:
+            buckets = [filters]
+
+        if (show_codes, show_flags, show_notes, null_values, limit) == (True, True, False, False, -1):
+            display = _DEFAULT_PARAMS
+        else:
+            display = (
+                ("show_codes", _BOOL_STR[show_codes]),
+                ("show_flags", _BOOL_STR[show_flags]),
+                ("show_notes", _BOOL_STR[show_notes]),
+                ("null_values", _BOOL_STR[null_values]),
+                ("limit", str(limit)),
+            )
+
+        # Formata os parâmetros corretamente (listas viram valores separados por vírgula)
+        params_list = [
+            [*((k, ",".join(map(str, v)) if isinstance(v, (list, tuple)) else v) for k, v in bucket.items()),
+             *display]
+            for bucket in buckets
+        ]
+
+        try:
+            if output_type == "csv":
+                try:
+                    csv_params = [params + [("output_type", "csv")] for params in params_list]
+                    frames = fetch_data_concurrently(url, csv_params, fetch=fetch_csv)
+                    return pd.concat(frames, copy=False, ignore_index=True)
+                except requests.HTTPError:
+                    # O servidor recusou a saída em CSV: volta para JSON
+                    output_type = "objects"
+
+            json_params = [params + [("output_type", output_type)] for params in params_list]
+            frames = fetch_data_concurrently(url, json_params, fetch=fetch_frame)
+            return pd.concat(frames, copy=False, ignore_index=True)
+        except Exception as e:
+            print(f"Erro ao acessar o domínio {domain_code}. Verifique se o domínio existe e os parâmetros estão corretos.")
+            raise
+
+
+# instância global
+faostat_api = FAOSTAT()
+
+
+def write_csv(df: pd.DataFrame, filename: str) -> None:
+    """Grava o DataFrame em CSV usando o pyarrow quando disponível."""
+    if pa is None:
+        df.to_csv(filename, index=False)
+        return
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filename)